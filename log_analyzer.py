@@ -0,0 +1,412 @@
+import re
+import sys
+import json
+import mmap
+import array
+import heapq
+import argparse
+from bisect import bisect_left, bisect_right
+from collections import Counter
+
+# Event kinds stored in the "kind" column
+STARTED, FINISHED, STORE, LOOKUP, RELEASE, SWAP = range(6)
+KIND_NAMES = ["Started", "Finished", "Store", "Lookup", "Release", "SWAP"]
+
+NO_VALUE = -1  # Placeholder for var/other on events that have no variable
+MISSING_VALUE = -2**63  # Placeholder in the value column; never a logged value, unlike -1 (lookup miss)
+MEMORY_MANAGER = 0  # pid recorded for events logged by the memory manager
+INT32_MAX = 2**31 - 1  # Largest pid the "i" column holds
+INT64_MAX = 2**63 - 1  # Largest clock or value the "q" columns hold
+
+BASE_BUCKET_MS = 1000  # Resolution of the precomputed SWAP aggregates
+HEATMAP_COLUMNS = 80  # Widest heatmap print_swap_heatmap will draw
+FAULT_BAR_WIDTH = 60  # Bar length print_fault_timeline draws for the busiest bucket
+SORT_CHUNK_ROWS = 1 << 20  # Rows sorted at a time when the log is out of order
+
+MAGIC = b"VMMLOG4\n"
+
+# Column name -> array typecode, in on-disk order
+COLUMNS = [
+    ("clock", "q"),
+    ("kind", "b"),
+    ("pid", "i"),
+    ("var", "i"),
+    ("other", "i"),  # Evicted variable for SWAP events
+    ("value", "q"),
+]
+
+# Aggregates built while parsing, so reports never scan rows
+AGGREGATES = [
+    ("swap_buckets", "q"),  # SWAPs per BASE_BUCKET_MS bucket, starting at first_bucket
+    ("swap_clocks", "q"),  # Sorted clock of every SWAP, for buckets finer than BASE_BUCKET_MS
+    ("evictions", "q"),  # SWAPs per evicted variable
+    ("eviction_var", "i"),  # Sparse (evicted variable, bucket) -> count
+    ("eviction_bucket", "q"),
+    ("eviction_count", "q"),
+]
+
+LINE_RE = re.compile(
+    r"Clock: (\d+), (?:"
+    r"Process (\d+): (Started|Finished)\."
+    r"|Process (\d+), (Store|Lookup|Release): Variable (\S+?)(?:, Value: (\S+))?"
+    r"|Memory Manager, SWAP: Variable (\S+) with Variable (\S+)"
+    r")$"
+)
+
+
+class LogIndex:
+    def __init__(self, arrays, variables, processes, first_bucket, unmatched=0):
+        self.arrays = arrays  # {name: array or memoryview} for COLUMNS and AGGREGATES, rows sorted by clock
+        self.variables = variables  # var column value -> variable id as logged
+        self.processes = processes  # {pid: counters}, see parse_log
+        self.first_bucket = first_bucket  # Bucket number of swap_buckets[0]
+        self.unmatched = unmatched  # "Clock:" lines that did not parse as an event or overflow a column
+        for name, _ in COLUMNS + AGGREGATES:
+            setattr(self, name, arrays[name])
+
+    def __len__(self):
+        return len(self.clock)
+
+    def rows_between(self, start, end):
+        # Time index: clock column is sorted, so a time window is a row range
+        return range(bisect_left(self.clock, start), bisect_right(self.clock, end))
+
+    def save(self, path):
+        header = {
+            "byteorder": sys.byteorder,
+            "arrays": [[name, typecode, len(self.arrays[name])] for name, typecode in COLUMNS + AGGREGATES],
+            "variables": self.variables,
+            "processes": self.processes,
+            "first_bucket": self.first_bucket,
+            "unmatched": self.unmatched,
+        }
+        header_bytes = json.dumps(header).encode()
+        # Pad with JSON whitespace so every array starts 8-byte aligned
+        header_bytes += b" " * (-(len(MAGIC) + 4 + len(header_bytes)) % 8)
+        with open(path, "wb") as f:
+            f.write(MAGIC)
+            f.write(len(header_bytes).to_bytes(4, "little"))
+            f.write(header_bytes)
+            for name, _ in COLUMNS + AGGREGATES:
+                values = self.arrays[name]
+                values.tofile(f)
+                f.write(bytes(-(len(values) * values.itemsize) % 8))
+
+    @classmethod
+    def load(cls, path):
+        # Map the file instead of reading it, so loading does not copy the columns
+        with open(path, "rb") as f:
+            data = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        if data[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a log index")
+        header_len = int.from_bytes(data[len(MAGIC):len(MAGIC) + 4], "little")
+        offset = len(MAGIC) + 4
+        header = json.loads(bytes(data[offset:offset + header_len]))
+        offset += header_len
+
+        arrays = {}
+        for name, typecode, length in header["arrays"]:
+            size = length * array.array(typecode).itemsize
+            raw = data[offset:offset + size]
+            if header["byteorder"] == sys.byteorder:
+                arrays[name] = raw.cast(typecode)
+            else:
+                values = array.array(typecode, bytes(raw))
+                values.byteswap()
+                arrays[name] = values
+            offset += size + -size % 8
+
+        # JSON turns the integer pid keys into strings
+        processes = {int(p): counters for p, counters in header["processes"].items()}
+        return cls(arrays, header["variables"], processes, header["first_bucket"], header["unmatched"])
+
+
+def parse_log(file_path):
+    columns = {name: array.array(typecode) for name, typecode in COLUMNS}
+    variables = []
+    var_ids = {}
+
+    def intern(var_id):
+        if var_id not in var_ids:
+            var_ids[var_id] = len(variables)
+            variables.append(var_id)
+        return var_ids[var_id]
+
+    processes = {}
+    previous = {}  # pid -> clock of the process's previous event in log order
+
+    def process(p, time):
+        if p not in processes:
+            processes[p] = {
+                "started": None, "finished": None, "first_clock": time, "last_clock": time,
+                "stores": 0, "lookups": 0, "releases": 0, "lookup_misses": 0,
+                "lookup_gap_total": 0,
+            }
+        counters = processes[p]
+        counters["first_clock"] = min(counters["first_clock"], time)
+        counters["last_clock"] = max(counters["last_clock"], time)
+        return counters
+
+    swap_buckets = Counter()
+    evictions = Counter()
+    eviction_buckets = Counter()
+    unmatched = 0
+
+    clock, kind, pid = columns["clock"], columns["kind"], columns["pid"]
+    var, other, value = columns["var"], columns["other"], columns["value"]
+
+    # Stream the log once, skipping lines that are not simulator events
+    with open(file_path) as f:
+        for line in f:
+            match = LINE_RE.match(line.rstrip("\n"))
+            if match is None:
+                if line.startswith("Clock:"):
+                    unmatched += 1
+                continue
+            (time, life_pid, life_event, cmd_pid, command, var_id,
+             result, swap_in, swap_out) = match.groups()
+            time = int(time)
+            if time > INT64_MAX or int(life_pid or cmd_pid or MEMORY_MANAGER) > INT32_MAX:
+                unmatched += 1
+                continue
+
+            clock.append(time)
+            if life_pid is not None:
+                p = int(life_pid)
+                counters = process(p, time)
+                counters["started" if life_event == "Started" else "finished"] = time
+                previous[p] = time
+                kind.append(STARTED if life_event == "Started" else FINISHED)
+                pid.append(p)
+                var.append(NO_VALUE)
+                other.append(NO_VALUE)
+                value.append(MISSING_VALUE)
+            elif cmd_pid is not None:
+                p = int(cmd_pid)
+                counters = process(p, time)
+                if command == "Store":
+                    counters["stores"] += 1
+                elif command == "Release":
+                    counters["releases"] += 1
+                else:
+                    counters["lookups"] += 1
+                    if result == "-1":
+                        counters["lookup_misses"] += 1
+                    # Time since the process's previous logged event, not a measured latency
+                    counters["lookup_gap_total"] += time - previous.get(p, time)
+                previous[p] = time
+                kind.append(KIND_NAMES.index(command))
+                pid.append(p)
+                var.append(intern(var_id))
+                other.append(NO_VALUE)
+                value.append(_int_value(result))
+            else:
+                evicted = intern(swap_out)
+                bucket = time // BASE_BUCKET_MS
+                swap_buckets[bucket] += 1
+                evictions[evicted] += 1
+                eviction_buckets[evicted, bucket] += 1
+                kind.append(SWAP)
+                pid.append(MEMORY_MANAGER)
+                var.append(intern(swap_in))
+                other.append(evicted)
+                value.append(MISSING_VALUE)
+
+    _sort_by_clock(columns)
+
+    first_bucket = min(swap_buckets, default=0)
+    last_bucket = max(swap_buckets, default=-1)
+    eviction_keys = sorted(eviction_buckets)
+    arrays = dict(columns)
+    arrays["swap_buckets"] = array.array("q", (swap_buckets[b] for b in range(first_bucket, last_bucket + 1)))
+    arrays["swap_clocks"] = array.array("q", (c for c, k in zip(columns["clock"], columns["kind"]) if k == SWAP))
+    arrays["evictions"] = array.array("q", (evictions[v] for v in range(len(variables))))
+    arrays["eviction_var"] = array.array("i", (v for v, _ in eviction_keys))
+    arrays["eviction_bucket"] = array.array("q", (b for _, b in eviction_keys))
+    arrays["eviction_count"] = array.array("q", (eviction_buckets[k] for k in eviction_keys))
+
+    return LogIndex(arrays, variables, processes, first_bucket, unmatched)
+
+
+def _int_value(text):
+    # Values that are absent, not ints, or too large for the column are stored as MISSING_VALUE
+    try:
+        number = int(text)
+    except (TypeError, ValueError):
+        return MISSING_VALUE
+    return number if MISSING_VALUE < number <= INT64_MAX else MISSING_VALUE
+
+
+def _sort_by_clock(columns):
+    # Threads can append slightly out of order; sort rows so the clock is an index
+    clock = columns["clock"]
+    disorder = next((i for i in range(len(clock) - 1) if clock[i] > clock[i + 1]), None)
+    if disorder is None:
+        return
+
+    # Rows up to the smallest clock after the first disorder are already in place
+    lowest = min(clock[i] for i in range(disorder + 1, len(clock)))
+    start = bisect_right(clock, lowest, 0, disorder + 1)
+
+    # Sort the tail in chunks and merge them into a compact permutation
+    runs = []
+    for lo in range(start, len(clock), SORT_CHUNK_ROWS):
+        hi = min(lo + SORT_CHUNK_ROWS, len(clock))
+        runs.append(array.array("q", sorted(range(lo, hi), key=clock.__getitem__)))
+    order = array.array("q", heapq.merge(*runs, key=clock.__getitem__))
+    del runs
+
+    # Rebuild one column tail at a time to keep peak memory down
+    for name, typecode in COLUMNS:
+        column = columns[name]
+        column[start:] = array.array(typecode, (column[i] for i in order))
+
+
+def _whole_buckets(bucket_ms):
+    # Round up to a multiple of the precomputed bucket size
+    return -(-bucket_ms // BASE_BUCKET_MS) * BASE_BUCKET_MS
+
+
+def fault_timeline(index, bucket_ms=1000, start=None, end=None):
+    # SWAP count per clock bucket: [(bucket_start, faults), ...]
+    # The window is widened to whole buckets
+    if not len(index):
+        return []
+    start = index.clock[0] if start is None else start
+    end = index.clock[-1] if end is None else end
+    first, last = start // bucket_ms, end // bucket_ms
+
+    if bucket_ms % BASE_BUCKET_MS:
+        # Finer than the precomputed buckets: bisect the sorted SWAP clocks at each bucket edge
+        edges = [bisect_left(index.swap_clocks, b * bucket_ms) for b in range(first, last + 2)]
+        return [(b * bucket_ms, hi - lo) for b, lo, hi in zip(range(first, last + 1), edges, edges[1:])]
+
+    scale = bucket_ms // BASE_BUCKET_MS
+    swaps = index.swap_buckets
+    timeline = []
+    for b in range(first, last + 1):
+        lo = max(b * scale - index.first_bucket, 0)
+        hi = min((b + 1) * scale - index.first_bucket, len(swaps))
+        timeline.append((b * bucket_ms, sum(swaps[lo:hi]) if lo < hi else 0))
+    return timeline
+
+
+def process_summaries(index):
+    result = {}
+    for p, counters in sorted(index.processes.items()):
+        summary = dict(counters)
+        gap_total = summary.pop("lookup_gap_total")
+        summary["mean_gap_before_lookup"] = gap_total / summary["lookups"] if summary["lookups"] else 0.0
+        result[p] = summary
+    return result
+
+
+def swap_heatmap(index, bucket_ms=1000):
+    # Evictions per clock bucket for each evicted variable: (bucket_starts, {var_id: [count, ...]})
+    # bucket_ms is rounded up to a multiple of BASE_BUCKET_MS
+    if not len(index.eviction_count):
+        return [], {}
+    bucket_ms = _whole_buckets(bucket_ms)
+    scale = bucket_ms // BASE_BUCKET_MS
+    first = index.clock[0] // bucket_ms
+    last = index.clock[-1] // bucket_ms
+    bucket_starts = [b * bucket_ms for b in range(first, last + 1)]
+
+    # Sparse entries are sorted by (variable, bucket), so each cell is a slice sum
+    var, buckets, counts = index.eviction_var, index.eviction_bucket, index.eviction_count
+    heatmap = {}
+    lo = 0
+    while lo < len(var):
+        v = var[lo]
+        hi = bisect_right(var, v, lo)
+        edges = [bisect_left(buckets, b * scale, lo, hi) for b in range(first, last + 2)]
+        heatmap[index.variables[v]] = [sum(counts[a:b]) for a, b in zip(edges, edges[1:])]
+        lo = hi
+    return bucket_starts, heatmap
+
+
+def hottest_evictions(index, top=10):
+    ranked = sorted(range(len(index.evictions)), key=index.evictions.__getitem__, reverse=True)
+    return [(index.variables[v], index.evictions[v]) for v in ranked[:top] if index.evictions[v]]
+
+
+def print_fault_timeline(index, bucket_ms):
+    timeline = fault_timeline(index, bucket_ms)
+    # Scale bars against the busiest bucket; any non-zero bucket gets at least one mark
+    peak = max((faults for _, faults in timeline), default=0)
+    print(f"{'Clock':>10}  Faults")
+    for bucket_start, faults in timeline:
+        bar = -(-faults * FAULT_BAR_WIDTH // peak) if peak else 0
+        print(f"{bucket_start:>10}  {faults:>6}  {'#' * bar}")
+
+
+def print_process_summaries(index):
+    print(f"{'Process':>7}  {'Started':>8}  {'Finished':>8}  {'Stores':>6}  {'Lookups':>7}  "
+          f"{'Misses':>6}  {'Releases':>8}  {'Mean gap before lookup':>22}")
+    for p, s in process_summaries(index).items():
+        print(f"{p:>7}  {str(s['started']):>8}  {str(s['finished']):>8}  {s['stores']:>6}  "
+              f"{s['lookups']:>7}  {s['lookup_misses']:>6}  {s['releases']:>8}  "
+              f"{s['mean_gap_before_lookup']:>20.1f}ms")
+
+
+def print_swap_heatmap(index, bucket_ms):
+    if not len(index.eviction_count):
+        print("No swaps.")
+        return
+
+    # Widen buckets until the whole run fits in HEATMAP_COLUMNS
+    first, last = index.clock[0], index.clock[-1]
+    bucket_ms = _whole_buckets(max(bucket_ms, -(-(last - first + 1) // HEATMAP_COLUMNS)))
+    while last // bucket_ms - first // bucket_ms >= HEATMAP_COLUMNS:
+        bucket_ms += BASE_BUCKET_MS
+
+    bucket_starts, heatmap = swap_heatmap(index, bucket_ms)
+    peak = max(max(row) for row in heatmap.values())
+    shades = " .:*#"
+    print(f"Evicted variable by clock bucket ({bucket_ms}ms per column)")
+    for var_id, total in hottest_evictions(index, top=len(heatmap)):
+        cells = "".join(shades[-(-n * (len(shades) - 1) // peak)] for n in heatmap[var_id])
+        print(f"Variable {var_id:>6} |{cells}| {total}")
+
+
+def positive_int(text):
+    number = int(text)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"{text} is not a positive integer")
+    return number
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Index and report on simulator output logs.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="parse a log into a binary columnar index")
+    build.add_argument("log", nargs="?", default="output.txt")
+    build.add_argument("index", nargs="?", default="output.idx")
+
+    for name in ("faults", "processes", "swaps"):
+        report = commands.add_parser(name, help=f"{name} report from an index")
+        report.add_argument("index", nargs="?", default="output.idx")
+
+    commands.choices["faults"].add_argument("--bucket", type=positive_int, default=1000, help="bucket size in ms")
+    commands.choices["swaps"].add_argument(
+        "--bucket", type=positive_int, default=1000,
+        help=f"bucket size in ms, rounded up to a multiple of {BASE_BUCKET_MS} and widened to fit "
+             f"{HEATMAP_COLUMNS} columns")
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        index = parse_log(args.log)
+        index.save(args.index)
+        print(f"Indexed {len(index)} events from {args.log} into {args.index}")
+        if index.unmatched:
+            print(f"Skipped {index.unmatched} unrecognised Clock: lines")
+    else:
+        index = LogIndex.load(args.index)
+        if args.command == "faults":
+            print_fault_timeline(index, args.bucket)
+        elif args.command == "processes":
+            print_process_summaries(index)
+        elif args.command == "swaps":
+            print_swap_heatmap(index, args.bucket)
@@ -0,0 +1,195 @@
+import os
+import sys
+import random
+
+import log_analyzer
+from log_analyzer import (
+    COLUMNS, AGGREGATES, NO_VALUE, MISSING_VALUE, LOOKUP, SWAP, LogIndex, parse_log,
+    fault_timeline, process_summaries, swap_heatmap, hottest_evictions,
+    print_fault_timeline,
+)
+
+OUTPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "output.txt")
+
+
+def rows(index):
+    return list(zip(*(index.arrays[name] for name, _ in COLUMNS)))
+
+
+def test_round_trip(tmp_path):
+    index = parse_log(OUTPUT)
+    index.save(tmp_path / "output.idx")
+    loaded = LogIndex.load(tmp_path / "output.idx")
+
+    assert len(loaded) == 43
+    for name, _ in COLUMNS + AGGREGATES:
+        assert list(loaded.arrays[name]) == list(index.arrays[name])
+    assert loaded.variables == index.variables
+    assert loaded.processes == index.processes
+    assert loaded.first_bucket == index.first_bucket
+    assert loaded.unmatched == 0
+
+
+def test_round_trip_other_byteorder(tmp_path, monkeypatch):
+    index = parse_log(OUTPUT)
+    expected = {name: list(index.arrays[name]) for name, _ in COLUMNS + AGGREGATES}
+
+    # Write the file as a machine with the opposite byte order would
+    for name, _ in COLUMNS + AGGREGATES:
+        index.arrays[name].byteswap()
+    with monkeypatch.context() as patch:
+        patch.setattr(sys, "byteorder", "big" if sys.byteorder == "little" else "little")
+        index.save(tmp_path / "swapped.idx")
+
+    loaded = LogIndex.load(tmp_path / "swapped.idx")
+    for name, _ in COLUMNS + AGGREGATES:
+        assert list(loaded.arrays[name]) == expected[name]
+
+
+def test_out_of_order_input(tmp_path, monkeypatch):
+    with open(OUTPUT) as f:
+        lines = f.readlines()
+    shuffled = lines[:]
+    random.Random(346).shuffle(shuffled)
+    log = tmp_path / "shuffled.txt"
+    log.write_text("".join(shuffled))
+
+    # Small chunks so the merge of sorted runs is exercised
+    monkeypatch.setattr(log_analyzer, "SORT_CHUNK_ROWS", 5)
+    index = parse_log(log)
+    expected = parse_log(OUTPUT)
+
+    assert list(index.clock) == sorted(index.clock)
+    named = lambda i: sorted((c, k, p, i.variables[v] if v != NO_VALUE else None,
+                              i.variables[o] if o != NO_VALUE else None, x)
+                             for c, k, p, v, o, x in rows(i))
+    assert named(index) == named(expected)
+    # The gap before a lookup follows log order, so only compare order-independent counters
+    drop_gap = lambda summaries: {p: {k: v for k, v in s.items() if k != "mean_gap_before_lookup"}
+                                  for p, s in summaries.items()}
+    assert drop_gap(process_summaries(index)) == drop_gap(process_summaries(expected))
+
+
+def test_unparsed_values_keep_event(tmp_path):
+    log = tmp_path / "values.txt"
+    log.write_text(
+        "Clock: 1000, Process 1, Store: Variable 1, Value: 2.5\n"
+        "Clock: 1100, Process 1, Lookup: Variable 1, Value: None\n"
+        "Clock: 1200, Process 1, Lookup: Variable 2, Value: -1\n"
+        "Clock: 1300, Process 1, something else\n"
+    )
+    index = parse_log(log)
+
+    assert len(index) == 3
+    # A lookup miss keeps its logged -1; only unparseable values become MISSING_VALUE
+    assert list(index.value) == [MISSING_VALUE, MISSING_VALUE, -1]
+    summary = process_summaries(index)[1]
+    assert (summary["stores"], summary["lookups"], summary["lookup_misses"]) == (1, 2, 1)
+    assert index.unmatched == 1
+
+
+def test_oversized_value_keeps_event(tmp_path):
+    log = tmp_path / "overflow.txt"
+    log.write_text(
+        "Clock: 1000, Process 1, Store: Variable 1, Value: 99999999999999999999\n"
+        "Clock: 1100, Process 1, Lookup: Variable 1, Value: -99999999999999999999\n"
+    )
+    index = parse_log(log)
+
+    assert len(index) == 2
+    assert list(index.value) == [MISSING_VALUE, MISSING_VALUE]
+    assert index.unmatched == 0
+
+
+def test_oversized_pid_is_skipped(tmp_path):
+    log = tmp_path / "overflow.txt"
+    log.write_text(
+        "Clock: 1000, Process 99999999999, Store: Variable 1, Value: 5\n"
+        "Clock: 1000, Process 99999999999: Started.\n"
+        "Clock: 1100, Process 1, Store: Variable 1, Value: 5\n"
+    )
+    index = parse_log(log)
+
+    assert len(index) == 1
+    assert list(index.pid) == [1]
+    assert list(index.processes) == [1]
+    assert index.unmatched == 2
+
+
+def test_oversized_clock_is_skipped(tmp_path):
+    log = tmp_path / "overflow.txt"
+    log.write_text(
+        "Clock: 99999999999999999999, Process 1, Store: Variable 1, Value: 5\n"
+        "Clock: 99999999999999999999, Memory Manager, SWAP: Variable 3 with Variable 1\n"
+        "Clock: 1100, Process 1, Store: Variable 1, Value: 5\n"
+    )
+    index = parse_log(log)
+
+    assert list(index.clock) == [1100]
+    assert len(index.swap_buckets) == 0
+    assert index.unmatched == 2
+
+
+def test_fault_timeline():
+    index = parse_log(OUTPUT)
+    timeline = fault_timeline(index)
+
+    assert sum(faults for _, faults in timeline) == 7
+    assert timeline[:3] == [(1000, 1), (2000, 1), (3000, 0)]
+    assert dict(timeline)[8000] == 2
+    assert fault_timeline(index, 5000) == [(0, 3), (5000, 4), (10000, 0)]
+    # Buckets finer than the stored aggregates bisect the sorted SWAP clocks
+    assert sum(faults for _, faults in fault_timeline(index, 250)) == 7
+    assert fault_timeline(index, 250, 8000, 8999) == [(8000, 1), (8250, 0), (8500, 0), (8750, 1)]
+    assert fault_timeline(index, 1500) == [(b * 1500, n) for b, n in enumerate([1, 1, 0, 2, 0, 2, 1, 0])]
+    assert fault_timeline(index, 1000, 8000, 8999) == [(8000, 2)]
+
+
+def test_fault_timeline_bars_are_scaled(tmp_path, capsys):
+    log = tmp_path / "swaps.txt"
+    log.write_text(
+        "Clock: 1000, Memory Manager, SWAP: Variable 1 with Variable 2\n" * 500
+        + "Clock: 2000, Memory Manager, SWAP: Variable 2 with Variable 1\n"
+    )
+    print_fault_timeline(parse_log(log), 1000)
+
+    bars = [line.split()[2] if len(line.split()) > 2 else "" for line in capsys.readouterr().out.splitlines()[1:]]
+    assert [len(bar) for bar in bars] == [log_analyzer.FAULT_BAR_WIDTH, 1]
+
+
+def test_process_summaries():
+    summaries = process_summaries(parse_log(OUTPUT))
+
+    counts = {p: (s["stores"], s["lookups"], s["releases"]) for p, s in summaries.items()}
+    assert counts == {1: (6, 3, 1), 2: (4, 2, 1), 3: (7, 5, 1)}
+    assert (summaries[2]["started"], summaries[2]["finished"]) == (1000, 3731)
+    assert summaries[3]["finished"] == 11431
+    assert all(s["lookup_misses"] == 0 for s in summaries.values())
+
+
+def test_lookup_misses_queryable_from_index(tmp_path):
+    log = tmp_path / "misses.txt"
+    log.write_text(
+        "Clock: 1000, Process 1: Started.\n"
+        "Clock: 1000, Process 1, Store: Variable 1, Value: -1\n"
+        "Clock: 1100, Process 1, Lookup: Variable 1, Value: -1\n"
+        "Clock: 1200, Process 1, Lookup: Variable 2, Value: -1\n"
+        "Clock: 1300, Process 1, Release: Variable 1\n"
+    )
+    index = parse_log(log)
+    index.save(tmp_path / "misses.idx")
+    loaded = LogIndex.load(tmp_path / "misses.idx")
+
+    misses = [row for row in range(len(loaded)) if loaded.kind[row] == LOOKUP and loaded.value[row] == -1]
+    assert [loaded.clock[row] for row in misses] == [1100, 1200]
+    assert list(loaded.value) == [MISSING_VALUE, -1, -1, -1, MISSING_VALUE]
+
+
+def test_swap_reports():
+    index = parse_log(OUTPUT)
+
+    assert hottest_evictions(index) == [("1", 4), ("3", 3)]
+    bucket_starts, heatmap = swap_heatmap(index, 5000)
+    assert bucket_starts == [0, 5000, 10000]
+    assert heatmap == {"1": [2, 2, 0], "3": [1, 2, 0]}
+    assert sum(1 for k in index.kind if k == SWAP) == 7